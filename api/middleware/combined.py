@@ -0,0 +1,157 @@
+"""Single ASGI layer combining security, request logging and error handling"""
+
+import os
+import time
+from typing import Dict, FrozenSet, List, Tuple
+
+import structlog
+from fastapi import status
+
+from api.middleware.error_handler import _build_error_response
+from api.responses import FastJSONResponse
+from utils import enhanced_logger
+
+logger = structlog.get_logger(__name__)
+
+# Static security headers appended to every HTTP response
+_SECURITY_HEADERS: List[Tuple[bytes, bytes]] = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"1; mode=block"),
+    (b"referrer-policy", b"strict-origin-when-cross-origin"),
+    (b"content-security-policy", b"default-src 'self'"),
+]
+
+# Request headers read by the middleware
+_HEADER_NAMES = frozenset((b"host", b"content-length", b"x-request-id", b"user-agent"))
+
+
+def _find_headers(scope, names: FrozenSet[bytes]) -> Dict[bytes, bytes]:
+    """Collect the named raw headers from an ASGI scope in a single pass"""
+    found = {}
+    for key, value in scope["headers"]:
+        if key in names:
+            found[key] = value
+    return found
+
+
+class CombinedMiddleware:
+    """Security, request logging and error handling in one middleware
+
+    Validates the host header and request size, assigns a request ID, logs
+    the request and response, adds security headers and turns unhandled
+    exceptions into JSON error responses, with a single send wrapper.
+    """
+
+    def __init__(
+        self, app, allowed_hosts: list = None, max_request_size: int = 10 * 1024 * 1024
+    ):
+        self.app = app
+        self.allowed_hosts = allowed_hosts or ["*"]
+        self.max_request_size = max_request_size
+
+        # Exact-match lookup sets; None means every host is allowed
+        if "*" in self.allowed_hosts:
+            self._exact_hosts = None
+            self._exact_hosts_bytes = None
+        else:
+            self._exact_hosts = frozenset(h.lower() for h in self.allowed_hosts)
+            self._exact_hosts_bytes = frozenset(
+                h.encode("latin-1") for h in self._exact_hosts
+            )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = _find_headers(scope, _HEADER_NAMES)
+        content_length = headers.get(b"content-length")
+        user_agent = headers.get(b"user-agent")
+
+        # Add request ID for tracing, reusing one set by an upstream proxy
+        request_id_bytes = headers.get(b"x-request-id")
+        if not request_id_bytes or len(request_id_bytes) > 128:
+            request_id_bytes = os.urandom(16).hex().encode()
+        request_id = request_id_bytes.decode("latin-1")
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        log_info = enhanced_logger.INFO_ENABLED
+        if log_info:
+            logger.info(
+                "Incoming request",
+                method=scope["method"],
+                path=scope["path"],
+                user_agent=user_agent.decode("latin-1") if user_agent else None,
+                request_id=request_id,
+            )
+
+        start_time = time.time()
+        response_started = False
+
+        # Add security headers and log completion
+        async def send_wrapper(message):
+            nonlocal response_started
+
+            if message["type"] == "http.response.start":
+                response_started = True
+
+                headers = list(message.get("headers", []))
+                headers.extend(_SECURITY_HEADERS)
+                headers.append((b"x-request-id", request_id_bytes))
+                message["headers"] = headers
+
+                if log_info:
+                    logger.info(
+                        "Request completed",
+                        status_code=message["status"],
+                        process_time=time.time() - start_time,
+                        request_id=request_id,
+                    )
+
+            await send(message)
+
+        rejection = self._check_request(headers.get(b"host", b""), content_length)
+        if rejection is not None:
+            status_code, detail = rejection
+            response = FastJSONResponse(
+                status_code=status_code, content={"detail": detail}
+            )
+            await response(scope, receive, send_wrapper)
+            return
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            # Too late to replace a response that is already on the wire
+            if response_started:
+                raise
+            response = _build_error_response(
+                exc, (request_id, scope["path"], scope["method"])
+            )
+            await response(scope, receive, send_wrapper)
+
+    def _check_request(self, host: bytes, content_length: bytes):
+        """Return (status code, detail) if the request must be rejected"""
+        if not self._validate_host(host):
+            return status.HTTP_400_BAD_REQUEST, "Invalid host header"
+
+        if content_length:
+            try:
+                size = int(content_length)
+            except ValueError:
+                return status.HTTP_400_BAD_REQUEST, "Invalid Content-Length header"
+            if size > self.max_request_size:
+                return status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, "Request too large"
+
+        return None
+
+    def _validate_host(self, host: bytes) -> bool:
+        """Validate the host header"""
+        if self._exact_hosts is None:
+            return True
+
+        # Strip the port, leaving bracketed IPv6 literals intact
+        if not host.endswith(b"]"):
+            host = host.rsplit(b":", 1)[0]
+        return host.lower() in self._exact_hosts_bytes
@@ -1,162 +1,29 @@
-"""Enhanced error handling middleware"""
+"""Custom exceptions and their JSON error responses"""
 
-import traceback
-from typing import Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import structlog
 from fastapi import HTTPException, Request, status
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
 from pydantic import ValidationError
 
+from api.responses import FastJSONResponse
+
 logger = structlog.get_logger(__name__)
 
 
-class ErrorHandlerMiddleware:
-    """Middleware for centralized error handling"""
-
-    def __init__(self, app):
-        self.app = app
-
-    async def __call__(self, scope, receive, send):
-        if scope["type"] != "http":
-            await self.app(scope, receive, send)
-            return
-
-        request = Request(scope, receive)
-
-        try:
-            await self.app(scope, receive, send)
-        except Exception as exc:
-            response = await self._handle_exception(request, exc)
-            await response(scope, receive, send)
-
-    async def _handle_exception(self, request: Request, exc: Exception) -> JSONResponse:
-        """Handle different types of exceptions"""
-        request_id = getattr(request.state, "request_id", None)
-
-        if isinstance(exc, HTTPException):
-            return await self._handle_http_exception(request, exc, request_id)
-        elif isinstance(exc, RequestValidationError):
-            return await self._handle_validation_error(request, exc, request_id)
-        elif isinstance(exc, ValidationError):
-            return await self._handle_pydantic_validation_error(
-                request, exc, request_id
-            )
-        else:
-            return await self._handle_internal_error(request, exc, request_id)
-
-    async def _handle_http_exception(
-        self, request: Request, exc: HTTPException, request_id: str
-    ) -> JSONResponse:
-        """Handle HTTP exceptions"""
-        logger.warning(
-            "HTTP exception occurred",
-            status_code=exc.status_code,
-            detail=exc.detail,
-            request_id=request_id,
-            path=request.url.path,
-            method=request.method,
-        )
-
-        return JSONResponse(
-            status_code=exc.status_code,
-            content={
-                "error": "HTTP_EXCEPTION",
-                "detail": exc.detail,
-                "request_id": request_id,
-            },
-        )
-
-    async def _handle_validation_error(
-        self, request: Request, exc: RequestValidationError, request_id: str
-    ) -> JSONResponse:
-        """Handle request validation errors"""
-        errors = []
-        for error in exc.errors():
-            errors.append(
-                {
-                    "field": ".".join(str(x) for x in error["loc"]),
-                    "message": error["msg"],
-                    "type": error["type"],
-                }
-            )
-
-        logger.warning(
-            "Request validation error",
-            errors=errors,
-            request_id=request_id,
-            path=request.url.path,
-            method=request.method,
-        )
-
-        return JSONResponse(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            content={
-                "error": "VALIDATION_ERROR",
-                "detail": "Request validation failed",
-                "errors": errors,
-                "request_id": request_id,
-            },
-        )
-
-    async def _handle_pydantic_validation_error(
-        self, request: Request, exc: ValidationError, request_id: str
-    ) -> JSONResponse:
-        """Handle Pydantic validation errors"""
-        errors = []
-        for error in exc.errors():
-            errors.append(
-                {
-                    "field": ".".join(str(x) for x in error["loc"]),
-                    "message": error["msg"],
-                    "type": error["type"],
-                }
-            )
-
-        logger.warning(
-            "Pydantic validation error",
-            errors=errors,
-            request_id=request_id,
-            path=request.url.path,
-            method=request.method,
-        )
-
-        return JSONResponse(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            content={
-                "error": "VALIDATION_ERROR",
-                "detail": "Data validation failed",
-                "errors": errors,
-                "request_id": request_id,
-            },
-        )
-
-    async def _handle_internal_error(
-        self, request: Request, exc: Exception, request_id: str
-    ) -> JSONResponse:
-        """Handle internal server errors"""
-        error_traceback = traceback.format_exc()
-
-        logger.error(
-            "Internal server error",
-            error_type=type(exc).__name__,
-            error_message=str(exc),
-            traceback=error_traceback,
-            request_id=request_id,
-            path=request.url.path,
-            method=request.method,
-        )
-
-        # Don't expose internal error details in production
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content={
-                "error": "INTERNAL_SERVER_ERROR",
-                "detail": "An internal server error occurred",
-                "request_id": request_id,
-            },
-        )
+def _format_validation_errors(
+    exc: Union[RequestValidationError, ValidationError],
+) -> List[Dict[str, Any]]:
+    """Flatten validation errors into field/message/type entries"""
+    return [
+        {
+            "field": ".".join(map(str, error["loc"])),
+            "message": error["msg"],
+            "type": error["type"],
+        }
+        for error in exc.errors()
+    ]
 
 
 # Custom exception classes
@@ -188,67 +55,164 @@ class ExternalServiceError(Exception):
         super().__init__(self.message)
 
 
-# Exception handlers for custom exceptions
-async def business_logic_error_handler(request: Request, exc: BusinessLogicError):
-    """Handle business logic errors"""
-    request_id = getattr(request.state, "request_id", None)
+# Detail builders: return (log fields, response body fields) for an exception
+def _http_exception_detail(exc: HTTPException):
+    return (
+        {"status_code": exc.status_code, "detail": exc.detail},
+        {"detail": exc.detail},
+    )
 
-    logger.warning(
-        "Business logic error",
-        error_code=exc.error_code,
-        message=exc.message,
-        request_id=request_id,
+
+def _request_validation_detail(exc: RequestValidationError):
+    errors = _format_validation_errors(exc)
+    return (
+        {"errors": errors},
+        {"detail": "Request validation failed", "errors": errors},
     )
 
-    return JSONResponse(
-        status_code=status.HTTP_400_BAD_REQUEST,
-        content={
-            "error": "BUSINESS_LOGIC_ERROR",
-            "error_code": exc.error_code,
-            "detail": exc.message,
-            "request_id": request_id,
-        },
+
+def _pydantic_validation_detail(exc: ValidationError):
+    errors = _format_validation_errors(exc)
+    return (
+        {"errors": errors},
+        {"detail": "Data validation failed", "errors": errors},
     )
 
 
-async def database_error_handler(request: Request, exc: DatabaseError):
-    """Handle database errors"""
-    request_id = getattr(request.state, "request_id", None)
+def _business_logic_detail(exc: BusinessLogicError):
+    return (
+        {"error_code": exc.error_code, "message": exc.message},
+        {"error_code": exc.error_code, "detail": exc.message},
+    )
 
-    logger.error(
-        "Database error",
-        operation=exc.operation,
-        message=exc.message,
-        request_id=request_id,
+
+def _database_detail(exc: DatabaseError):
+    return (
+        {"operation": exc.operation, "message": exc.message},
+        {"detail": "A database error occurred"},
     )
 
-    return JSONResponse(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content={
-            "error": "DATABASE_ERROR",
-            "detail": "A database error occurred",
-            "request_id": request_id,
+
+def _external_service_detail(exc: ExternalServiceError):
+    return (
+        {
+            "service": exc.service,
+            "status_code": exc.status_code,
+            "message": exc.message,
         },
+        {"detail": f"External service ({exc.service}) is unavailable"},
     )
 
 
-async def external_service_error_handler(request: Request, exc: ExternalServiceError):
-    """Handle external service errors"""
-    request_id = getattr(request.state, "request_id", None)
+def _internal_error_detail(exc: Exception):
+    # Don't expose internal error details in production
+    return (
+        {
+            "error_type": type(exc).__name__,
+            "error_message": str(exc),
+            "exc_info": exc,
+        },
+        {"detail": "An internal server error occurred"},
+    )
+
 
-    logger.error(
+# Exception type -> (status code, error code, log level, log event, detail builder)
+# A status code of None means the exception carries its own (HTTPException).
+_EXC_TABLE: Dict[type, Tuple[Optional[int], str, str, str, Callable]] = {
+    HTTPException: (
+        None,
+        "HTTP_EXCEPTION",
+        "warning",
+        "HTTP exception occurred",
+        _http_exception_detail,
+    ),
+    RequestValidationError: (
+        status.HTTP_422_UNPROCESSABLE_ENTITY,
+        "VALIDATION_ERROR",
+        "warning",
+        "Request validation error",
+        _request_validation_detail,
+    ),
+    ValidationError: (
+        status.HTTP_422_UNPROCESSABLE_ENTITY,
+        "VALIDATION_ERROR",
+        "warning",
+        "Pydantic validation error",
+        _pydantic_validation_detail,
+    ),
+    BusinessLogicError: (
+        status.HTTP_400_BAD_REQUEST,
+        "BUSINESS_LOGIC_ERROR",
+        "warning",
+        "Business logic error",
+        _business_logic_detail,
+    ),
+    DatabaseError: (
+        status.HTTP_500_INTERNAL_SERVER_ERROR,
+        "DATABASE_ERROR",
+        "error",
+        "Database error",
+        _database_detail,
+    ),
+    ExternalServiceError: (
+        status.HTTP_502_BAD_GATEWAY,
+        "EXTERNAL_SERVICE_ERROR",
+        "error",
         "External service error",
-        service=exc.service,
-        status_code=exc.status_code,
-        message=exc.message,
+        _external_service_detail,
+    ),
+    Exception: (
+        status.HTTP_500_INTERNAL_SERVER_ERROR,
+        "INTERNAL_SERVER_ERROR",
+        "error",
+        "Internal server error",
+        _internal_error_detail,
+    ),
+}
+
+
+def _lookup_exc_entry(exc: Exception):
+    """Find the table entry for an exception, falling back along its MRO"""
+    for cls in type(exc).__mro__:
+        entry = _EXC_TABLE.get(cls)
+        if entry is not None:
+            return entry
+
+
+def _build_error_response(
+    exc: Exception, ctx: Tuple[Optional[str], str, str]
+) -> FastJSONResponse:
+    """Log an exception and build its JSON error response"""
+    request_id, path, method = ctx
+    status_code, error_code, level, event, build_detail = _lookup_exc_entry(exc)
+    log_fields, body = build_detail(exc)
+
+    getattr(logger, level)(
+        event,
+        **log_fields,
         request_id=request_id,
+        path=path,
+        method=method,
     )
 
-    return JSONResponse(
-        status_code=status.HTTP_502_BAD_GATEWAY,
-        content={
-            "error": "EXTERNAL_SERVICE_ERROR",
-            "detail": f"External service ({exc.service}) is unavailable",
-            "request_id": request_id,
-        },
+    return FastJSONResponse(
+        status_code=exc.status_code if status_code is None else status_code,
+        content={"error": error_code, **body, "request_id": request_id},
     )
+
+
+# Exception handler for custom exceptions
+async def custom_exception_handler(request: Request, exc: Exception):
+    """Handle BusinessLogicError, DatabaseError and ExternalServiceError"""
+    ctx = (
+        getattr(request.state, "request_id", None),
+        request.url.path,
+        request.method,
+    )
+    return _build_error_response(exc, ctx)
+
+
+# Names of the former per-exception handlers, kept for importers
+business_logic_error_handler = custom_exception_handler
+database_error_handler = custom_exception_handler
+external_service_error_handler = custom_exception_handler
@@ -1,136 +1,32 @@
 """Security middleware for enhanced protection"""
 
-import time
-import uuid
+import html
+import re
 from typing import Callable
 
-import bleach
+import orjson
 import structlog
 from fastapi import HTTPException, Request, Response, status
-from fastapi.responses import JSONResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 from slowapi.util import get_remote_address
 
+from api.responses import FastJSONResponse
+from config import settings
+
 logger = structlog.get_logger(__name__)
 
 # Rate limiter
 limiter = Limiter(key_func=get_remote_address)
 
 
-class SecurityMiddleware:
-    """Custom security middleware for request validation and sanitization"""
-
-    def __init__(
-        self, app, allowed_hosts: list = None, max_request_size: int = 10 * 1024 * 1024
-    ):
-        self.app = app
-        self.allowed_hosts = allowed_hosts or ["*"]
-        self.max_request_size = max_request_size
-
-    async def __call__(self, scope, receive, send):
-        if scope["type"] != "http":
-            await self.app(scope, receive, send)
-            return
-
-        request = Request(scope, receive)
-
-        # Add request ID for tracing
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
-
-        # Validate host header
-        if not self._validate_host(request):
-            response = JSONResponse(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                content={"detail": "Invalid host header"},
-            )
-            await response(scope, receive, send)
-            return
-
-        # Check request size
-        content_length = request.headers.get("content-length")
-        if content_length and int(content_length) > self.max_request_size:
-            response = JSONResponse(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                content={"detail": "Request too large"},
-            )
-            await response(scope, receive, send)
-            return
-
-        # Add security headers
-        async def send_wrapper(message):
-            if message["type"] == "http.response.start":
-                headers = dict(message.get("headers", []))
-
-                # Security headers
-                security_headers = {
-                    b"x-content-type-options": b"nosniff",
-                    b"x-frame-options": b"DENY",
-                    b"x-xss-protection": b"1; mode=block",
-                    b"referrer-policy": b"strict-origin-when-cross-origin",
-                    b"content-security-policy": b"default-src 'self'",
-                    b"x-request-id": request_id.encode(),
-                }
-
-                for key, value in security_headers.items():
-                    headers[key] = value
-
-                message["headers"] = [(k, v) for k, v in headers.items()]
-
-            await send(message)
-
-        await self.app(scope, receive, send_wrapper)
-
-    def _validate_host(self, request: Request) -> bool:
-        """Validate the host header"""
-        if "*" in self.allowed_hosts:
-            return True
-
-        host = request.headers.get("host", "").lower()
-        return any(allowed_host.lower() in host for allowed_host in self.allowed_hosts)
-
-
-class RequestValidationMiddleware:
-    """Middleware for input validation and sanitization"""
-
-    def __init__(self, app):
-        self.app = app
-
-    async def __call__(self, scope, receive, send):
-        if scope["type"] != "http":
-            await self.app(scope, receive, send)
-            return
-
-        request = Request(scope, receive)
-
-        # Log request
-        logger.info(
-            "Incoming request",
-            method=request.method,
-            url=str(request.url),
-            user_agent=request.headers.get("user-agent"),
-            request_id=getattr(request.state, "request_id", None),
-        )
-
-        start_time = time.time()
-
-        async def send_wrapper(message):
-            if message["type"] == "http.response.start":
-                process_time = time.time() - start_time
-
-                # Log response
-                logger.info(
-                    "Request completed",
-                    status_code=message["status"],
-                    process_time=process_time,
-                    request_id=getattr(request.state, "request_id", None),
-                )
-
-            await send(message)
+# Characters the sanitizer would strip or escape; payloads without any are left as-is
+_HTML_SENTINELS = re.compile(rb"[<>&]")
 
-        await self.app(scope, receive, send_wrapper)
+# HTML tags, comments and declarations, removed by sanitize_input. A "<" not
+# followed by a tag name is text and is escaped instead.
+_TAG_RE = re.compile(r"</?[A-Za-z!?][^>]*>")
 
 
 def sanitize_input(data: str) -> str:
@@ -138,13 +34,21 @@ def sanitize_input(data: str) -> str:
     if not isinstance(data, str):
         return data
 
-    # Remove potentially harmful HTML/JavaScript
-    return bleach.clean(
-        data,
-        tags=[],  # No HTML tags allowed
-        attributes={},  # No attributes allowed
-        strip=True,
-    )
+    if settings.SANITIZER_USE_BLEACH:
+        # Imported lazily: bleach pulls in html5lib, which slows worker startup
+        import bleach
+
+        # Remove potentially harmful HTML/JavaScript
+        return bleach.clean(
+            data,
+            tags=[],  # No HTML tags allowed
+            attributes={},  # No attributes allowed
+            strip=True,
+        )
+
+    # Same policy as bleach with no allowed tags: drop tags, then escape what
+    # is left so decoded entities cannot reintroduce markup
+    return html.escape(html.unescape(_TAG_RE.sub("", data)), quote=False)
 
 
 def validate_json_input(data: dict) -> dict:
@@ -152,6 +56,13 @@ def validate_json_input(data: dict) -> dict:
     if not isinstance(data, dict):
         return data
 
+    # Fast path: nothing to sanitize if no HTML metacharacters appear anywhere
+    try:
+        if _HTML_SENTINELS.search(orjson.dumps(data, default=str)) is None:
+            return data
+    except TypeError:
+        pass
+
     sanitized = {}
     for key, value in data.items():
         if isinstance(value, str):
@@ -182,7 +93,7 @@ async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
         request_id=getattr(request.state, "request_id", None),
     )
 
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status.HTTP_429_TOO_MANY_REQUESTS,
         content={
             "detail": "Rate limit exceeded. Please try again later.",
@@ -0,0 +1,14 @@
+"""Shared response classes"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson instead of the stdlib encoder"""
+
+    def render(self, content: Any) -> bytes:
+        # Stringify non-str dict keys like the stdlib encoder did
+        return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
@@ -1,30 +1,32 @@
+import os
+
 from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import make_asgi_app
 from slowapi import Limiter
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
 
-from api.middleware.error_handler import ErrorHandlerMiddleware
-from api.middleware.security import (
-    RequestValidationMiddleware,
-    SecurityMiddleware,
-    rate_limit_handler,
-)
+from api.middleware.combined import CombinedMiddleware
+from api.middleware.security import rate_limit_handler
+from api.responses import FastJSONResponse
 from api.routes import alerts, assets, auth, detection, events, health, simulation
 from config import settings
 from core.database.connection import close_mongo_connection, connect_to_mongo
+from utils.enhanced_logger import setup_logging
+
+setup_logging()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     openapi_url=f"{settings.API_PREFIX}/openapi.json",
     docs_url=f"{settings.API_PREFIX}/docs",
+    default_response_class=FastJSONResponse,
 )
 
 # Enhance security middleware
-app.add_middleware(SecurityMiddleware, allowed_hosts=settings.ALLOWED_HOSTS)
-app.add_middleware(RequestValidationMiddleware)
-app.add_middleware(ErrorHandlerMiddleware)
+app.add_middleware(CombinedMiddleware, allowed_hosts=settings.ALLOWED_HOSTS)
 limiter = Limiter(key_func=get_remote_address)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, rate_limit_handler)
@@ -38,9 +40,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Database events
-app.add_event_handler("startup", connect_to_mongo)
-app.add_event_handler("shutdown", close_mongo_connection)
+# Database events (tests mock the repositories and connect explicitly if needed)
+if not os.getenv("TESTING"):
+    app.add_event_handler("startup", connect_to_mongo)
+    app.add_event_handler("shutdown", close_mongo_connection)
+
+# Prometheus metrics (e.g. log_records_dropped_total)
+if settings.METRICS_ENABLED:
+    app.mount("/metrics", make_asgi_app())
 
 # Include API routes
 app.include_router(health.router, prefix=settings.API_PREFIX, tags=["health"])
@@ -22,6 +22,18 @@ class Settings(BaseSettings):
     VERSION: str = "1.0.0"
     ALLOWED_HOSTS: list = ["*"]
 
+    # Use bleach instead of the built-in tag stripper for input sanitization
+    SANITIZER_USE_BLEACH: bool = False
+
+    # Logging
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"
+    LOG_QUEUE_MAXSIZE: int = Field(20000, gt=0)
+    LOG_FLUSH_INTERVAL_MS: int = Field(500, gt=0)
+
+    # Monitoring
+    METRICS_ENABLED: bool = True
+
     # Integration services
     CORE_ENGINE_URL: Optional[str] = None
     RESPONSE_SERVICE_URL: Optional[str] = None
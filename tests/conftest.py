@@ -0,0 +1,15 @@
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Must be set before the app is imported so startup skips the Mongo connection
+os.environ.setdefault("TESTING", "1")
+
+from app import app  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
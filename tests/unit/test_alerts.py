@@ -3,13 +3,9 @@ from datetime import datetime
 from unittest.mock import AsyncMock, patch
 
 from bson import ObjectId
-from fastapi.testclient import TestClient
 
-from app import app
 from utils.security import create_access_token
 
-client = TestClient(app)
-
 # Mock alert data
 mock_alert_data = {
     "_id": str(ObjectId("60d5ec2dcb43a5e37d0c7513")),
@@ -53,11 +49,11 @@ def get_auth_headers():
 
 @patch("api.routes.alerts.AlertService")
 @patch("core.database.repositories.user_repository.UserRepository")
-def test_get_alerts(mock_user_repo_class, mock_alert_service_class):
+def test_get_alerts(mock_user_repo_class, mock_alert_service_class, client):
     # Setup mocks
     mock_user_repo = mock_user_repo_class.return_value
     mock_user_repo.find_by_id = AsyncMock(return_value=mock_user_data)
-    
+
     mock_alert_service = mock_alert_service_class.return_value
     mock_alert_service.get_alerts = AsyncMock(return_value=[mock_alert_data])
 
@@ -71,13 +67,15 @@ def test_get_alerts(mock_user_repo_class, mock_alert_service_class):
 
 @patch("api.routes.alerts.AlertService")
 @patch("core.database.repositories.user_repository.UserRepository")
-def test_create_alert(mock_user_repo_class, mock_alert_service_class):
+def test_create_alert(mock_user_repo_class, mock_alert_service_class, client):
     # Setup mocks
     mock_user_repo = mock_user_repo_class.return_value
     mock_user_repo.find_by_id = AsyncMock(return_value=mock_user_data)
-    
+
     mock_alert_service = mock_alert_service_class.return_value
-    mock_alert_service.create_alert = AsyncMock(return_value=str(mock_alert_data["_id"]))
+    mock_alert_service.create_alert = AsyncMock(
+        return_value=str(mock_alert_data["_id"])
+    )
     mock_alert_service.get_alert_by_id = AsyncMock(return_value=mock_alert_data)
 
     # Test create alert
@@ -104,11 +102,11 @@ def test_create_alert(mock_user_repo_class, mock_alert_service_class):
 
 @patch("api.routes.alerts.AlertService")
 @patch("core.database.repositories.user_repository.UserRepository")
-def test_get_alert_by_id(mock_user_repo_class, mock_alert_service_class):
+def test_get_alert_by_id(mock_user_repo_class, mock_alert_service_class, client):
     # Setup mocks
     mock_user_repo = mock_user_repo_class.return_value
     mock_user_repo.find_by_id = AsyncMock(return_value=mock_user_data)
-    
+
     mock_alert_service = mock_alert_service_class.return_value
     mock_alert_service.get_alert_by_id = AsyncMock(return_value=mock_alert_data)
 
@@ -124,11 +122,11 @@ def test_get_alert_by_id(mock_user_repo_class, mock_alert_service_class):
 
 @patch("api.routes.alerts.AlertService")
 @patch("core.database.repositories.user_repository.UserRepository")
-def test_get_alert_not_found(mock_user_repo_class, mock_alert_service_class):
+def test_get_alert_not_found(mock_user_repo_class, mock_alert_service_class, client):
     # Setup mocks
     mock_user_repo = mock_user_repo_class.return_value
     mock_user_repo.find_by_id = AsyncMock(return_value=mock_user_data)
-    
+
     mock_alert_service = mock_alert_service_class.return_value
     mock_alert_service.get_alert_by_id = AsyncMock(return_value=None)
 
@@ -143,13 +141,13 @@ def test_get_alert_not_found(mock_user_repo_class, mock_alert_service_class):
 
 @patch("api.routes.alerts.AlertService")
 @patch("core.database.repositories.user_repository.UserRepository")
-def test_update_alert(mock_user_repo_class, mock_alert_service_class):
+def test_update_alert(mock_user_repo_class, mock_alert_service_class, client):
     # Setup mocks
     mock_user_repo = mock_user_repo_class.return_value
     mock_user_repo.find_by_id = AsyncMock(return_value=mock_user_data)
-    
+
     mock_alert_service = mock_alert_service_class.return_value
-    
+
     updated_alert = mock_alert_data.copy()
     updated_alert["status"] = "in_progress"
     updated_alert["notes"] = "Investigating this alert"
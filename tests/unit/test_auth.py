@@ -2,11 +2,6 @@ from datetime import datetime
 from unittest.mock import AsyncMock, patch
 
 from bson import ObjectId
-from fastapi.testclient import TestClient
-
-from app import app
-
-client = TestClient(app)
 
 mock_user_data = {
     "_id": str(ObjectId("60d5ec2dcb43a5e37d0c7513")),
@@ -26,7 +21,7 @@ mock_user_data = {
 
 @patch("api.routes.auth.verify_password")
 @patch("api.routes.auth.UserRepository")
-def test_login_success(mock_user_repo_class, mock_verify_password):
+def test_login_success(mock_user_repo_class, mock_verify_password, client):
     # Setup mocks
     mock_user_repo = mock_user_repo_class.return_value
     mock_user_repo.find_by_username = AsyncMock(return_value=mock_user_data)
@@ -46,7 +41,7 @@ def test_login_success(mock_user_repo_class, mock_verify_password):
 
 @patch("api.routes.auth.verify_password")
 @patch("api.routes.auth.UserRepository")
-def test_login_wrong_password(mock_user_repo_class, mock_verify_password):
+def test_login_wrong_password(mock_user_repo_class, mock_verify_password, client):
     # Setup mocks
     mock_user_repo = mock_user_repo_class.return_value
     mock_user_repo.find_by_username = AsyncMock(return_value=mock_user_data)
@@ -62,7 +57,7 @@ def test_login_wrong_password(mock_user_repo_class, mock_verify_password):
 
 
 @patch("api.routes.auth.UserRepository")
-def test_login_user_not_found(mock_user_repo_class):
+def test_login_user_not_found(mock_user_repo_class, client):
     # Setup mocks
     mock_user_repo = mock_user_repo_class.return_value
     mock_user_repo.find_by_username = AsyncMock(return_value=None)
@@ -77,7 +72,7 @@ def test_login_user_not_found(mock_user_repo_class):
 
 
 @patch("api.routes.auth.UserRepository")
-def test_register_success(mock_user_repo_class):
+def test_register_success(mock_user_repo_class, client):
     # Setup mocks
     mock_user_repo = mock_user_repo_class.return_value
     mock_user_repo.find_by_username = AsyncMock(return_value=None)
@@ -103,7 +98,7 @@ def test_register_success(mock_user_repo_class):
 
 
 @patch("api.routes.auth.UserRepository")
-def test_register_username_exists(mock_user_repo_class):
+def test_register_username_exists(mock_user_repo_class, client):
     # Setup mocks
     mock_user_repo = mock_user_repo_class.return_value
     mock_user_repo.find_by_username = AsyncMock(return_value=mock_user_data)
@@ -0,0 +1,50 @@
+import io
+import logging
+import queue
+import sys
+
+import orjson
+import pytest
+import structlog
+from prometheus_client import REGISTRY
+
+from utils import enhanced_logger
+
+
+@pytest.fixture
+def log_output(monkeypatch):
+    """Route JSON logging into a buffer; read it after stopping the listener"""
+    stream = io.StringIO()
+    monkeypatch.setattr(sys, "stdout", stream)
+    enhanced_logger.setup_logging()
+    yield stream
+    monkeypatch.undo()
+    enhanced_logger.setup_logging()
+
+
+def test_exception_traceback_is_rendered(log_output):
+    logger = structlog.get_logger("tests.enhanced_logger")
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        logger.exception("Request failed")
+
+    enhanced_logger._stop_listener()
+    record = orjson.loads(log_output.getvalue().splitlines()[-1])
+
+    assert record["event"] == "Request failed"
+    assert record["logger"] == "tests.enhanced_logger"
+    assert "Traceback" in record["exception"]
+    assert "RuntimeError: boom" in record["exception"]
+
+
+def test_full_queue_drops_records_without_blocking():
+    handler = enhanced_logger.DroppingQueueHandler(queue.Queue(maxsize=1))
+    record = logging.LogRecord("tests", logging.INFO, __file__, 1, "x", None, None)
+    before = REGISTRY.get_sample_value("log_records_dropped_total")
+
+    handler.handle(record)
+    handler.handle(record)
+
+    assert handler.queue.qsize() == 1
+    assert REGISTRY.get_sample_value("log_records_dropped_total") == before + 1
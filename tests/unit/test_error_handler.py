@@ -0,0 +1,105 @@
+import orjson
+import pytest
+from fastapi import HTTPException
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+
+from api.middleware.error_handler import (
+    BusinessLogicError,
+    DatabaseError,
+    ExternalServiceError,
+    _build_error_response,
+)
+
+CTX = ("rid", "/p", "GET")
+
+
+def _render(exc: Exception):
+    response = _build_error_response(exc, CTX)
+    return response.status_code, orjson.loads(response.body)
+
+
+class _Model(BaseModel):
+    x: int
+
+
+def test_http_exception_keeps_its_status():
+    status_code, body = _render(HTTPException(status_code=404, detail="Not found"))
+    assert status_code == 404
+    assert body == {
+        "error": "HTTP_EXCEPTION",
+        "detail": "Not found",
+        "request_id": "rid",
+    }
+
+
+def test_request_validation_error():
+    exc = RequestValidationError([{"loc": ("body", "x"), "msg": "m", "type": "t"}])
+    status_code, body = _render(exc)
+    assert status_code == 422
+    assert body == {
+        "error": "VALIDATION_ERROR",
+        "detail": "Request validation failed",
+        "errors": [{"field": "body.x", "message": "m", "type": "t"}],
+        "request_id": "rid",
+    }
+
+
+def test_pydantic_validation_error():
+    with pytest.raises(ValidationError) as exc_info:
+        _Model(x="not a number")
+    status_code, body = _render(exc_info.value)
+    assert status_code == 422
+    assert body["error"] == "VALIDATION_ERROR"
+    assert body["detail"] == "Data validation failed"
+    assert body["errors"][0]["field"] == "x"
+
+
+def test_business_logic_error():
+    status_code, body = _render(BusinessLogicError("Nope", error_code="E1"))
+    assert status_code == 400
+    assert body == {
+        "error": "BUSINESS_LOGIC_ERROR",
+        "error_code": "E1",
+        "detail": "Nope",
+        "request_id": "rid",
+    }
+
+
+def test_database_error_hides_message():
+    status_code, body = _render(DatabaseError("secret", operation="insert"))
+    assert status_code == 500
+    assert body == {
+        "error": "DATABASE_ERROR",
+        "detail": "A database error occurred",
+        "request_id": "rid",
+    }
+
+
+def test_external_service_error_names_service():
+    status_code, body = _render(ExternalServiceError("down", service="threat-intel"))
+    assert status_code == 502
+    assert body == {
+        "error": "EXTERNAL_SERVICE_ERROR",
+        "detail": "External service (threat-intel) is unavailable",
+        "request_id": "rid",
+    }
+
+
+def test_unknown_exception_hides_message():
+    status_code, body = _render(RuntimeError("secret"))
+    assert status_code == 500
+    assert body == {
+        "error": "INTERNAL_SERVER_ERROR",
+        "detail": "An internal server error occurred",
+        "request_id": "rid",
+    }
+
+
+def test_subclass_uses_parent_entry():
+    class QuotaError(BusinessLogicError):
+        pass
+
+    status_code, body = _render(QuotaError("Over quota"))
+    assert status_code == 400
+    assert body["error"] == "BUSINESS_LOGIC_ERROR"
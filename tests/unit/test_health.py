@@ -1,18 +1,17 @@
-from fastapi.testclient import TestClient
-
-from app import app
-
-client = TestClient(app)
-
-
-def test_root_endpoint():
+def test_root_endpoint(client):
     response = client.get("/")
     assert response.status_code == 200
     assert "Welcome to the UTDRS API Gateway" in response.json()["message"]
 
 
-def test_health_endpoint():
+def test_health_endpoint(client):
     response = client.get("/api/v1/health")
     assert response.status_code == 200
     assert response.json()["status"] == "ok"
     assert response.json()["service"] == "api-gateway"
+
+
+def test_metrics_endpoint(client):
+    response = client.get("/metrics/")
+    assert response.status_code == 200
+    assert "log_records_dropped_total" in response.text
@@ -0,0 +1,66 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.middleware.combined import CombinedMiddleware
+
+
+def _client_for(exc: Exception) -> TestClient:
+    """Client for an app whose only route raises the given exception"""
+    test_app = FastAPI()
+    test_app.add_middleware(CombinedMiddleware)
+
+    @test_app.get("/boom")
+    async def boom():
+        raise exc
+
+    return TestClient(test_app)
+
+
+def test_exact_host_match():
+    middleware = CombinedMiddleware(None, allowed_hosts=["api.example.com"])
+    assert middleware._validate_host(b"api.example.com")
+    assert middleware._validate_host(b"API.example.com:8443")
+    assert not middleware._validate_host(b"evil-api.example.com")
+    assert not middleware._validate_host(b"")
+
+
+def test_wildcard_host():
+    middleware = CombinedMiddleware(None)
+    assert middleware._validate_host(b"anything.test")
+
+
+def test_security_headers_added_to_responses(client):
+    response = client.get("/")
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert response.headers["x-frame-options"] == "DENY"
+    assert len(response.headers["x-request-id"]) == 32
+
+
+def test_inbound_request_id_is_reused(client):
+    response = client.get("/", headers={"X-Request-ID": "upstream-id"})
+    assert response.headers["x-request-id"] == "upstream-id"
+
+
+def test_unhandled_exception_returns_json_error_with_security_headers():
+    response = _client_for(RuntimeError("boom")).get(
+        "/boom", headers={"X-Request-ID": "req-1"}
+    )
+
+    assert response.status_code == 500
+    assert response.json() == {
+        "error": "INTERNAL_SERVER_ERROR",
+        "detail": "An internal server error occurred",
+        "request_id": "req-1",
+    }
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert response.headers["x-request-id"] == "req-1"
+
+
+def test_malformed_content_length_rejected():
+    response = _client_for(RuntimeError("unreachable")).get(
+        "/boom", headers={"Content-Length": "abc"}
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid Content-Length header"
+    assert response.headers["x-content-type-options"] == "nosniff"
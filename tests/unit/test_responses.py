@@ -0,0 +1,8 @@
+import orjson
+
+from api.responses import FastJSONResponse
+
+
+def test_fast_json_response_stringifies_non_str_keys():
+    response = FastJSONResponse(content={1: "a", "b": {2: "c"}})
+    assert orjson.loads(response.body) == {"1": "a", "b": {"2": "c"}}
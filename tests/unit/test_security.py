@@ -0,0 +1,41 @@
+from api.middleware.security import sanitize_input, validate_json_input
+
+
+def test_sanitize_input_strips_tags():
+    assert sanitize_input("<b>hello</b> world") == "hello world"
+    assert sanitize_input("<script>alert(1)</script>") == "alert(1)"
+
+
+def test_sanitize_input_escapes_remaining_markup():
+    assert sanitize_input("a & b") == "a &amp; b"
+    assert sanitize_input("a &amp; b") == "a &amp; b"
+    assert sanitize_input("&lt;script&gt;") == "&lt;script&gt;"
+    assert sanitize_input("<script") == "&lt;script"
+
+
+def test_sanitize_input_keeps_text_between_stray_brackets():
+    assert sanitize_input("1 < 2 and 3 > 2") == "1 &lt; 2 and 3 &gt; 2"
+    assert sanitize_input("<3 you > them") == "&lt;3 you &gt; them"
+
+
+def test_sanitize_input_ignores_non_strings():
+    assert sanitize_input(42) == 42
+    assert sanitize_input(None) is None
+
+
+def test_validate_json_input_clean_payload_unchanged():
+    data = {"title": "Suspicious Activity", "tags": ["login"], "count": 3}
+    assert validate_json_input(data) is data
+
+
+def test_validate_json_input_sanitizes_nested_values():
+    data = {
+        "title": "<i>Alert</i>",
+        "meta": {"note": "<b>x</b>"},
+        "tags": ["<u>a</u>", 1],
+    }
+    assert validate_json_input(data) == {
+        "title": "Alert",
+        "meta": {"note": "x"},
+        "tags": ["a", 1],
+    }
@@ -1,70 +1,182 @@
 """Enhanced logging configuration with structured logging"""
 
-import json
+import atexit
+import io
 import logging
-import os
+import logging.handlers
+import queue
 import sys
-from datetime import datetime
-from typing import Any, Dict
+import threading
+from typing import Any
 
+import orjson
 import structlog
+from prometheus_client import Counter
 
-from config.production import settings
+# config.production is shadowed by config.py and cannot be imported, so the
+# app settings carry the logging options as well
+from config import settings
 
+# Whether INFO events are emitted; read by the request middleware to skip
+# building per-request log calls. Unconfigured structlog logs every level.
+INFO_ENABLED = True
 
-class JSONFormatter(logging.Formatter):
-    """Custom JSON formatter for structured logging"""
+# Background listener that owns the real output handlers
+_listener = None
 
-    def format(self, record: logging.LogRecord) -> str:
-        log_data = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "level": record.levelname,
-            "logger": record.name,
-            "message": record.getMessage(),
-            "module": record.module,
-            "function": record.funcName,
-            "line": record.lineno,
-        }
+# Periodic flusher for the buffered console stream
+_flush_stop = None
+_flush_thread = None
 
-        # Add extra fields
-        if hasattr(record, "request_id"):
-            log_data["request_id"] = record.request_id
+# Records discarded because the log queue was full (None if metrics are off)
+_dropped = (
+    Counter(
+        "log_records_dropped_total",
+        "Log records discarded because the log queue was full",
+    )
+    if settings.METRICS_ENABLED
+    else None
+)
+
+
+class StructlogQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that leaves structlog event dicts for the listener"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # structlog events carry their event dict in record.msg; pass them
+        # through untouched so ProcessorFormatter renders them in the listener
+        if isinstance(record.msg, dict):
+            return record
+        return super().prepare(record)
+
+
+class DroppingQueueHandler(StructlogQueueHandler):
+    """Queue handler that discards records instead of blocking when full"""
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if _dropped is not None:
+                _dropped.inc()
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    """Queue listener whose stop sentinel waits for room in a bounded queue"""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
 
-        if hasattr(record, "user_id"):
-            log_data["user_id"] = record.user_id
 
-        if hasattr(record, "extra_data"):
-            log_data.update(record.extra_data)
+class BufferedStreamHandler(logging.StreamHandler):
+    """Stream handler that leaves flushing to a periodic timer"""
 
-        return json.dumps(log_data, default=str)
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+def _orjson_dumps_str(obj: Any, **kwargs) -> str:
+    """orjson serializer for renderers that must return text"""
+    return orjson.dumps(obj, **kwargs).decode()
+
+
+def _capture_exc_info(logger, method_name: str, event_dict: dict) -> dict:
+    """Resolve exc_info=True while the exception is still being handled
+
+    The traceback is rendered on the listener thread, where sys.exc_info()
+    no longer refers to the caller's exception.
+    """
+    if event_dict.get("exc_info") is True:
+        event_dict["exc_info"] = sys.exc_info()
+    return event_dict
+
+
+def _buffered_stdout():
+    """Open a block-buffered text stream on the stdout file descriptor"""
+    if sys.stdout is not sys.__stdout__:
+        # stdout was replaced (e.g. captured by a test runner), whose fd may
+        # be closed before the flusher stops
+        return sys.stdout
+
+    try:
+        fd = sys.stdout.fileno()
+    except (AttributeError, io.UnsupportedOperation):
+        return sys.stdout
+
+    raw = io.FileIO(fd, "wb", closefd=False)
+    return io.TextIOWrapper(
+        io.BufferedWriter(raw, buffer_size=65536),
+        encoding="utf-8",
+        write_through=False,
+    )
+
+
+def _flush_periodically(handler: logging.Handler, stop: threading.Event):
+    """Flush the handler every LOG_FLUSH_INTERVAL_MS until stopped"""
+    interval = settings.LOG_FLUSH_INTERVAL_MS / 1000
+    while True:
+        stopped = stop.wait(interval)
+        try:
+            handler.flush()
+        except (OSError, ValueError):
+            # A broken pipe or closed stream must not kill the flusher
+            pass
+        if stopped:
+            return
 
 
 def setup_logging():
     """Setup structured logging with appropriate handlers"""
+    global INFO_ENABLED, _listener, _flush_stop, _flush_thread
+
+    level = getattr(logging, settings.LOG_LEVEL.upper())
+    json_format = settings.LOG_FORMAT.lower() == "json"
 
     # Configure structlog
-    structlog.configure(
-        processors=[
-            structlog.stdlib.filter_by_level,
-            structlog.stdlib.add_logger_name,
-            structlog.stdlib.add_log_level,
-            structlog.stdlib.PositionalArgumentsFormatter(),
-            structlog.processors.StackInfoRenderer(),
-            structlog.processors.format_exc_info,
-            structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer(),
-        ],
-        context_class=dict,
-        logger_factory=structlog.stdlib.LoggerFactory(),
-        wrapper_class=structlog.stdlib.BoundLogger,
-        cache_logger_on_first_use=True,
-    )
+    if json_format:
+        # Events are only wrapped here; rendering with orjson happens in the
+        # ProcessorFormatter on the QueueListener thread
+        structlog.configure(
+            processors=[
+                structlog.stdlib.add_logger_name,
+                structlog.stdlib.add_log_level,
+                structlog.processors.TimeStamper(fmt="iso", utc=True),
+                _capture_exc_info,
+                structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+            ],
+            context_class=dict,
+            logger_factory=structlog.stdlib.LoggerFactory(),
+            wrapper_class=structlog.make_filtering_bound_logger(level),
+            cache_logger_on_first_use=True,
+        )
+    else:
+        structlog.configure(
+            processors=[
+                structlog.stdlib.filter_by_level,
+                structlog.stdlib.add_logger_name,
+                structlog.stdlib.add_log_level,
+                structlog.stdlib.PositionalArgumentsFormatter(),
+                structlog.processors.StackInfoRenderer(),
+                structlog.processors.format_exc_info,
+                structlog.processors.UnicodeDecoder(),
+                structlog.processors.JSONRenderer(),
+            ],
+            context_class=dict,
+            logger_factory=structlog.stdlib.LoggerFactory(),
+            wrapper_class=structlog.stdlib.BoundLogger,
+            cache_logger_on_first_use=True,
+        )
 
     # Configure Python logging
     logging.basicConfig(
         format="%(message)s",
         stream=sys.stdout,
-        level=getattr(logging, settings.LOG_LEVEL.upper()),
+        level=level,
     )
 
     # Set up root logger
@@ -75,10 +187,24 @@ def setup_logging():
         root_logger.removeHandler(handler)
 
     # Create console handler
-    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler = BufferedStreamHandler(_buffered_stdout())
 
-    if settings.LOG_FORMAT.lower() == "json":
-        console_handler.setFormatter(JSONFormatter())
+    if json_format:
+        console_handler.setFormatter(
+            structlog.stdlib.ProcessorFormatter(
+                processors=[
+                    structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+                    structlog.processors.format_exc_info,
+                    structlog.processors.JSONRenderer(serializer=_orjson_dumps_str),
+                ],
+                # Records from stdlib loggers (uvicorn, pymongo, ...)
+                foreign_pre_chain=[
+                    structlog.stdlib.add_logger_name,
+                    structlog.stdlib.add_log_level,
+                    structlog.processors.TimeStamper(fmt="iso", utc=True),
+                ],
+            )
+        )
     else:
         console_handler.setFormatter(
             logging.Formatter(
@@ -87,8 +213,25 @@ def setup_logging():
             )
         )
 
-    root_logger.addHandler(console_handler)
-    root_logger.setLevel(getattr(logging, settings.LOG_LEVEL.upper()))
+    # Hand records to a background thread so stdout writes and formatting
+    # stay off the request path
+    _stop_listener()
+    log_queue = queue.Queue(maxsize=settings.LOG_QUEUE_MAXSIZE)
+    _listener = _QueueListener(log_queue, console_handler, respect_handler_level=True)
+    _listener.start()
+
+    # Batch stdout writes and flush them on a fixed interval
+    _flush_stop = threading.Event()
+    _flush_thread = threading.Thread(
+        target=_flush_periodically,
+        args=(console_handler, _flush_stop),
+        name="log-flusher",
+        daemon=True,
+    )
+    _flush_thread.start()
+
+    root_logger.addHandler(DroppingQueueHandler(log_queue))
+    root_logger.setLevel(level)
 
     # Set log levels for specific loggers
     logging.getLogger("uvicorn").setLevel(logging.INFO)
@@ -96,6 +239,8 @@ def setup_logging():
     logging.getLogger("motor").setLevel(logging.WARNING)
     logging.getLogger("pymongo").setLevel(logging.WARNING)
 
+    INFO_ENABLED = root_logger.isEnabledFor(logging.INFO)
+
 
 def get_logger(name: str):
     """Get a structured logger instance"""
@@ -106,12 +251,13 @@ class ContextualLogger:
     """Logger with automatic context injection"""
 
     def __init__(self, name: str):
+        self.name = name
         self.logger = get_logger(name)
         self.context = {}
 
     def bind(self, **kwargs) -> "ContextualLogger":
         """Bind context to logger"""
-        new_logger = ContextualLogger(self.logger._logger.name)
+        new_logger = ContextualLogger(self.name)
         new_logger.context = {**self.context, **kwargs}
         new_logger.logger = self.logger.bind(**new_logger.context)
         return new_logger
@@ -142,5 +288,18 @@ def get_contextual_logger(name: str) -> ContextualLogger:
     return ContextualLogger(name)
 
 
-# Initialize logging on import
-setup_logging()
+def _stop_listener():
+    """Flush and stop the background log listener and flusher"""
+    global _listener, _flush_thread
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+    if _flush_thread is not None:
+        _flush_stop.set()
+        _flush_thread.join()
+        _flush_thread = None
+
+
+atexit.register(_stop_listener)
@@ -8,6 +8,14 @@ if __name__ == "__main__":
     # Default to localhost for security, allow override via environment
     host = os.getenv("HOST", "127.0.0.1")
     port = int(os.getenv("PORT", "8000"))
-    reload = os.getenv("RELOAD", "true").lower() == "true"
-    
-    uvicorn.run("app:app", host=host, port=port, reload=reload)
+    reload = os.getenv("RELOAD", "false").lower() == "true"
+    workers = int(os.getenv("WORKERS", "1"))
+
+    uvicorn.run(
+        "app:app",
+        host=host,
+        port=port,
+        reload=reload,
+        http="httptools",
+        workers=workers,
+    )